@@ -15,7 +15,7 @@ Features (must-have included):
  - Resizable, adaptive layout
  - Light/Dark theme + theme toggle
  - Mini mode (compact overlay)
- - Safe expression evaluation (AST-based) — no eval()
+ - Safe expression evaluation (AST-validated, then compiled)
  - Packable to .exe with PyInstaller
 
 Dependencies:
@@ -29,95 +29,157 @@ To make .exe:
     pyinstaller --onefile --windowed --name calculator2025 calculator2025.py
 """
 
-import sys, math, ast, traceback
+import sys, math, ast, functools, re, types
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 # ----------------------------
 # Safe evaluator (AST-based)
 # ----------------------------
-SAFE_MATH = {k: getattr(math, k) for k in dir(math) if not k.startswith("__")}
-SAFE_MATH.update({
-    "pi": math.pi,
-    "e": math.e,
-    "sqrt": math.sqrt,
-    "ln": math.log,
+@functools.lru_cache(maxsize=1024)
+def _fact(n: int):
+    # repeated ! presses on the same value become a cache hit
+    return math.factorial(n)
+
+# only the names the UI can produce; read-only so nothing can patch it at runtime
+SAFE_MATH = types.MappingProxyType({
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
     "log": math.log10,
-    "pow": pow,
+    "ln": math.log,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "factorial": _fact,
     "abs": abs,
-    "factorial": math.factorial,
+    "pow": pow,
+    "pi": math.pi,
+    "e": math.e,
 })
 
 class EvalError(Exception):
     pass
 
-def safe_eval(expr: str):
+_BINOP_NODES = {ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow}
+_UNOP_NODES = {ast.USub, ast.UAdd}
+_ALLOWED_NODES = {ast.Expression, ast.Constant, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, *_BINOP_NODES, *_UNOP_NODES}
+
+# single-char display symbols; ^ and √ change length so they stay as replace()
+_NORMALIZE = str.maketrans({"×": "*", "÷": "/"})
+
+def _parse(expr: str):
+    """Normalize display symbols and parse expr into an ast.Expression."""
+    expr = expr.translate(_NORMALIZE).replace("^", "**").replace("√", "sqrt")
+    try:
+        return ast.parse(expr, mode='eval')
+    except RecursionError:
+        raise EvalError("Expression too deeply nested")
+    except Exception:
+        raise EvalError("Syntax error")
+
+def _validate(node):
+    """Walk the tree once and reject anything outside the calculator grammar."""
+    for n in ast.walk(node):
+        if type(n) not in _ALLOWED_NODES:
+            raise EvalError("Unsupported expression")
+        if isinstance(n, ast.Constant) and not isinstance(n.value, (int, float)):
+            raise EvalError("Invalid constant")
+        if isinstance(n, ast.Call) and (not isinstance(n.func, ast.Name) or n.keywords):
+            raise EvalError("Invalid function")
+        if isinstance(n, ast.Name) and n.id not in SAFE_MATH and n.id != "ANS":
+            raise EvalError("Name not allowed")
+
+@functools.lru_cache(maxsize=128)
+def _compile(expr: str):
+    """
+    Parse, validate and compile expr to bytecode.
+    Returns (code, None), or (None, reason) if expr is rejected, so validation runs once
+    per expression and re-evaluating invalid text doesn't re-parse it either.
+    Cached so realtime evaluation doesn't re-parse the same text on every keystroke.
+    """
+    try:
+        node = _parse(expr)
+        _validate(node)
+    except EvalError as e:
+        return None, str(e)
+    # no n-ary rewrite needed: +/* chains compile to a flat run of BINARY_OP instructions,
+    # evaluated on the interpreter's own value stack. Only the compiler itself recurses.
+    try:
+        return compile(node, '<calc>', 'eval'), None
+    except RecursionError:
+        return None, "Expression too deeply nested"
+
+def safe_eval(expr: str, ans=0.0):
     """
     Safely evaluate math expression using ast.
     Supports numbers, + - * / ** % unary ops, parentheses, and allowed functions/names.
+    ANS refers to the ans argument, so the compiled code is reused as ANS changes.
+    The tree is validated before compiling, so the compiled code can only do arithmetic
+    and call SAFE_MATH entries.
     """
-    # Quick cleanup
-    expr = expr.replace("×", "*").replace("÷", "/").replace("^", "**").replace("√", "sqrt")
-    # Parse
+    code, err = _compile(expr)
+    if code is None:
+        raise EvalError(err)
     try:
-        node = ast.parse(expr, mode='eval')
-    except Exception:
-        raise EvalError("Syntax error")
-    def _eval(node):
-        if isinstance(node, ast.Expression):
-            return _eval(node.body)
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return node.value
-            else:
-                raise EvalError("Invalid constant")
-        if isinstance(node, ast.BinOp):
-            l = _eval(node.left); r = _eval(node.right)
-            op = node.op
-            if isinstance(op, ast.Add): return l + r
-            if isinstance(op, ast.Sub): return l - r
-            if isinstance(op, ast.Mult): return l * r
-            if isinstance(op, ast.Div):
-                if r == 0: raise EvalError("Division by zero")
-                return l / r
-            if isinstance(op, ast.Mod): return l % r
-            if isinstance(op, ast.Pow): return l ** r
-            raise EvalError("Unsupported binary op")
-        if isinstance(node, ast.UnaryOp):
-            val = _eval(node.operand)
-            if isinstance(node.op, ast.USub): return -val
-            if isinstance(node.op, ast.UAdd): return +val
-            raise EvalError("Unsupported unary op")
-        if isinstance(node, ast.Call):
-            if not isinstance(node.func, ast.Name):
-                raise EvalError("Invalid function")
-            fname = node.func.id
-            if fname not in SAFE_MATH:
-                raise EvalError(f"Function {fname} not allowed")
-            args = [_eval(a) for a in node.args]
-            try:
-                return SAFE_MATH[fname](*args)
-            except Exception as e:
-                raise EvalError("Function error")
-        if isinstance(node, ast.Name):
-            if node.id in SAFE_MATH:
-                return SAFE_MATH[node.id]
-            raise EvalError("Name not allowed")
-        raise EvalError("Unsupported expression")
-    result = _eval(node)
+        result = eval(code, {"__builtins__": {}, "ANS": ans}, SAFE_MATH)
+    except ZeroDivisionError:
+        raise EvalError("Division by zero")
+    except (ArithmeticError, ValueError, TypeError):
+        raise EvalError("Math error")
     if isinstance(result, complex):
         raise EvalError("Complex result not supported")
     return result
 
+# characters after which an expression can't be complete yet
+_PENDING_CHARS = set("+-*/%^×÷√(")
+
+# clipboard paste filter: digits, operators, parens, dot, letters (for functions).
+# Everything allowed is ASCII, so non-ASCII is dropped by encode() and the rest by
+# a C-level bytes.translate instead of a per-character Python loop.
+_PASTE_ALLOWED = "0123456789.+-*/()%eEpiPIabcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_PASTE_DELETE = bytes(b for b in range(128) if chr(b) not in _PASTE_ALLOWED)
+
+# ANS as a whole word, expanded to its value in history entries
+_ANS_RE = re.compile(r"\bANS\b")
+
+# display format for float results
+_NUM_FMT = ".12g"
+
+# button text -> token appended to the expression
+_TOKEN_MAP = {
+    "0": "0", "1": "1", "2": "2", "3": "3", "4": "4",
+    "5": "5", "6": "6", "7": "7", "8": "8", "9": "9",
+    ".": ".", "(": "(", ")": ")",
+    "+": "+", "-": "-", "×": "*", "÷": "/", "^": "**",
+    "sin": "sin(", "cos": "cos(", "tan": "tan(",
+    "ln": "ln(", "log": "log(", "√": "sqrt(",
+}
+
+# oldest history entries are dropped past this many
+_HISTORY_LIMIT = 500
+
 # ----------------------------
 # UI Components
 # ----------------------------
+_FONT_CACHE = {}
+
+def _font(size, weight=None):
+    """Shared "Segoe UI" QFont per (size, weight); every button uses the same one."""
+    key = (size, weight)
+    f = _FONT_CACHE.get(key)
+    if f is None:
+        f = QtGui.QFont("Segoe UI", size) if weight is None else QtGui.QFont("Segoe UI", size, weight)
+        _FONT_CACHE[key] = f
+    return f
+
 class RoundedButton(QtWidgets.QPushButton):
     def __init__(self, text, slot=None, min_h=48):
         super().__init__(text)
         self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
         self.setMinimumHeight(min_h)
-        f = QtGui.QFont("Segoe UI", 11)
-        self.setFont(f)
+        self.setFont(_font(11))
         if slot:
             self.clicked.connect(slot)
 
@@ -133,6 +195,23 @@ class CalcWindow(QtWidgets.QWidget):
         self.last_ans = 0.0
         self.mini_mode = False
         self.dark_mode = True
+        # running state of expr_label, used to skip evaluating unfinished input
+        self._paren_depth = 0
+        self._ends_in_op = False
+        self._has_content = False
+        # numeric value behind result_edit (None when it shows an error)
+        self._last_display_value = 0
+        self._last_out = "0"  # text currently in result_edit
+
+        # coalesce bursts of keystrokes (key repeat, paste) into one live evaluation
+        self._eval_timer = QtCore.QTimer(self)
+        self._eval_timer.setSingleShot(True)
+        self._eval_timer.setInterval(30)
+        self._eval_timer.timeout.connect(self._do_live_eval)
+
+        # both themes are fixed, so build the stylesheets once
+        self._ss_dark = self._stylesheet(dark=True)
+        self._ss_light = self._stylesheet(dark=False)
 
         self._build_ui()
         self._apply_styles()
@@ -150,7 +229,7 @@ class CalcWindow(QtWidgets.QWidget):
         # Top bar: title, theme toggle, mini toggle, close
         topbar = QtWidgets.QHBoxLayout()
         title = QtWidgets.QLabel("Calculator")
-        title.setFont(QtGui.QFont("Segoe UI", 14, QtGui.QFont.Weight.DemiBold))
+        title.setFont(_font(14, QtGui.QFont.Weight.DemiBold))
         topbar.addWidget(title)
         topbar.addStretch()
 
@@ -171,13 +250,13 @@ class CalcWindow(QtWidgets.QWidget):
         # Expression label (small) + result lineedit
         self.expr_label = QtWidgets.QLabel("")
         self.expr_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        self.expr_label.setFont(QtGui.QFont("Segoe UI", 10))
+        self.expr_label.setFont(_font(10))
         left.addWidget(self.expr_label)
 
         self.result_edit = QtWidgets.QLineEdit("0")
         self.result_edit.setReadOnly(True)
         self.result_edit.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        self.result_edit.setFont(QtGui.QFont("Segoe UI", 28, QtGui.QFont.Weight.Bold))
+        self.result_edit.setFont(_font(28, QtGui.QFont.Weight.Bold))
         self.result_edit.setMinimumHeight(72)
         self.result_edit.setFrame(False)
         left.addWidget(self.result_edit)
@@ -195,23 +274,31 @@ class CalcWindow(QtWidgets.QWidget):
         self.grid.setSpacing(8)
 
         # We'll prepare a structure of buttons (r, c, text, slot, colspan)
+        # plain token buttons share one slot that reads the token stored on the button
+        tok = self._token_clicked
         btns = [
-            (0,0,"(", lambda: self._add("(")), (0,1,")", lambda: self._add(")")), (0,2,"⌫", self.backspace), (0,3,"AC", self.all_clear),
-            (1,0,"7", lambda: self._add("7")), (1,1,"8", lambda: self._add("8")), (1,2,"9", lambda: self._add("9")), (1,3,"÷", lambda: self._add("/")),
-            (2,0,"4", lambda: self._add("4")), (2,1,"5", lambda: self._add("5")), (2,2,"6", lambda: self._add("6")), (2,3,"×", lambda: self._add("*")),
-            (3,0,"1", lambda: self._add("1")), (3,1,"2", lambda: self._add("2")), (3,2,"3", lambda: self._add("3")), (3,3,"-", lambda: self._add("-")),
-            (4,0,"0", lambda: self._add("0")), (4,1,".", lambda: self._add(".")), (4,2,"%", self.on_percent), (4,3,"+", lambda: self._add("+")),
+            (0,0,"(", tok), (0,1,")", tok), (0,2,"⌫", self.backspace), (0,3,"AC", self.all_clear),
+            (1,0,"7", tok), (1,1,"8", tok), (1,2,"9", tok), (1,3,"÷", tok),
+            (2,0,"4", tok), (2,1,"5", tok), (2,2,"6", tok), (2,3,"×", tok),
+            (3,0,"1", tok), (3,1,"2", tok), (3,2,"3", tok), (3,3,"-", tok),
+            (4,0,"0", tok), (4,1,".", tok), (4,2,"%", self.on_percent), (4,3,"+", tok),
             # scientific / extra row (initially visible)
-            (5,0,"sin", lambda: self._add("sin(")), (5,1,"cos", lambda: self._add("cos(")), (5,2,"tan", lambda: self._add("tan(")), (5,3,"^", lambda: self._add("**")),
-            (6,0,"ln", lambda: self._add("ln(")), (6,1,"log", lambda: self._add("log(")), (6,2,"√", lambda: self._add("sqrt(")), (6,3,"!", self.on_factorial),
+            (5,0,"sin", tok), (5,1,"cos", tok), (5,2,"tan", tok), (5,3,"^", tok),
+            (6,0,"ln", tok), (6,1,"log", tok), (6,2,"√", tok), (6,3,"!", self.on_factorial),
             (7,0,"±", self.toggle_plusminus), (7,1,"ANS", self.insert_ans), (7,2,"1/x", self.on_reciprocal), (7,3,"=", self.on_equals),
         ]
 
         # Add buttons to grid
+        self._sci_widgets = []  # rows 5-7, hidden in mini mode
         for r,c,t,slot in btns:
             btn = RoundedButton(t, slot)
             # larger 0 button spans 2 columns? keep simple: 0 single cell for consistency in resizing
             self.grid.addWidget(btn, r, c)
+            if slot == tok:
+                # token travels on the button; the label is display-only (themes may add "&")
+                btn.setProperty("token", _TOKEN_MAP[t])
+            if r >= 5:
+                self._sci_widgets.append(btn)
         left.addLayout(self.grid)
 
         # keyboard input helper (hidden QLineEdit for pasting/typing) - allow focus
@@ -224,9 +311,12 @@ class CalcWindow(QtWidgets.QWidget):
         # Right: history panel
         self.history_panel = QtWidgets.QVBoxLayout()
         hlabel = QtWidgets.QLabel("History")
-        hlabel.setFont(QtGui.QFont("Segoe UI", 12, QtGui.QFont.Weight.DemiBold))
+        hlabel.setFont(_font(12, QtGui.QFont.Weight.DemiBold))
         self.history_panel.addWidget(hlabel)
         self.history_list = QtWidgets.QListWidget()
+        # every row is one line of text; uniform sizes let Qt skip per-item layout
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
         self.history_list.itemClicked.connect(self.on_history_click)
         self.history_panel.addWidget(self.history_list)
         main.addLayout(self.history_panel, 1)
@@ -277,10 +367,10 @@ class CalcWindow(QtWidgets.QWidget):
 
     def _apply_styles(self):
         # basic modern style with light and dark variants
-        self.setStyleSheet(self._stylesheet())
+        self.setStyleSheet(self._ss_dark if self.dark_mode else self._ss_light)
 
-    def _stylesheet(self):
-        if self.dark_mode:
+    def _stylesheet(self, dark: bool):
+        if dark:
             bg = "#0F1724"  # deep navy
             card = "rgba(255,255,255,0.04)"
             text = "#E6EEF3"
@@ -324,13 +414,44 @@ class CalcWindow(QtWidgets.QWidget):
     # ----------------------------
     # Input / Expression handling
     # ----------------------------
+    def _track(self, token: str):
+        for ch in token:
+            if ch == "(":
+                self._paren_depth += 1
+            elif ch == ")":
+                self._paren_depth -= 1
+            if not ch.isspace():
+                self._ends_in_op = ch in _PENDING_CHARS
+                self._has_content = True
+
+    def _set_expr(self, text: str):
+        # replace the whole expression and recompute the running state once
+        self.expr_label.setText(text)
+        self._paren_depth = 0
+        self._ends_in_op = False
+        self._has_content = False
+        self._track(text)
+
+    def _can_eval(self) -> bool:
+        return self._paren_depth == 0 and not self._ends_in_op and self._has_content
+
+    def _token_clicked(self):
+        self._add(self.sender().property("token"))
+
     def _add(self, token: str):
         cur = self.expr_label.text()
         cur += token
         self.expr_label.setText(cur)
-        # realtime evaluate
+        self._track(token)
+        # realtime evaluate (skip prefixes that can't parse yet)
+        if self._can_eval():
+            self._eval_timer.start()
+
+    def _do_live_eval(self):
+        if not self._can_eval():
+            return
         try:
-            val = safe_eval(cur)
+            val = safe_eval(self.expr_label.text(), self.last_ans)
             self._set_result_display(val)
         except Exception:
             # don't change result until valid
@@ -339,12 +460,14 @@ class CalcWindow(QtWidgets.QWidget):
     def backspace(self):
         txt = self.expr_label.text()
         if txt:
-            self.expr_label.setText(txt[:-1])
-            try:
-                val = safe_eval(self.expr_label.text()) if self.expr_label.text() else 0
-                self._set_result_display(val)
-            except Exception:
-                pass
+            self._set_expr(txt[:-1])
+            if not self._has_content:
+                self._set_result_display(0)
+            elif self._can_eval():
+                try:
+                    self._set_result_display(safe_eval(self.expr_label.text(), self.last_ans))
+                except Exception:
+                    pass
 
     def on_percent(self):
         # percent converts last number into division by 100; simple implementation: append '/100'
@@ -356,10 +479,10 @@ class CalcWindow(QtWidgets.QWidget):
             return
         # try evaluate expr and apply factorial if integer and non-negative
         try:
-            val = safe_eval(expr)
+            val = safe_eval(expr, self.last_ans)
             if val < 0 or int(val) != val:
                 raise EvalError("Factorial domain")
-            res = math.factorial(int(val))
+            res = _fact(int(val))
             self._commit_result(res, f"fact({int(val)})")
         except Exception:
             # fallback: append 'factorial(' to expression for user to complete
@@ -371,27 +494,28 @@ class CalcWindow(QtWidgets.QWidget):
             self._add("-")
             return
         try:
-            val = safe_eval(txt)
+            val = safe_eval(txt, self.last_ans)
             val = -val
             # replace display
-            self.expr_label.setText(str(val))
+            self._set_expr(str(val))
             self._set_result_display(val)
         except Exception:
             # naive toggle: add/remove leading -
             if txt.startswith("-"):
-                self.expr_label.setText(txt[1:])
+                self._set_expr(txt[1:])
             else:
-                self.expr_label.setText("-" + txt)
+                self._set_expr("-" + txt)
 
     def insert_ans(self):
-        self._add(str(self.last_ans))
+        # inserted by name so templates like "ANS*1.18" compile once and reuse the bytecode
+        self._add("ANS")
 
     def on_reciprocal(self):
         txt = self.expr_label.text().strip()
         if not txt:
             return
         try:
-            val = safe_eval(txt)
+            val = safe_eval(txt, self.last_ans)
             if val == 0:
                 raise EvalError("Division by zero")
             res = 1.0 / val
@@ -405,10 +529,10 @@ class CalcWindow(QtWidgets.QWidget):
         if not expr:
             return
         try:
-            val = safe_eval(expr)
+            val = safe_eval(expr, self.last_ans)
             self._commit_result(val, expr)
             self._set_result_display(val)
-            self.expr_label.setText("")  # reset expr to empty; result visible
+            self._set_expr("")  # reset expr to empty; result visible
         except EvalError:
             self._set_result_text("Error")
         except Exception:
@@ -417,25 +541,45 @@ class CalcWindow(QtWidgets.QWidget):
     def _set_result_display(self, val):
         # format nicely
         if isinstance(val, float):
-            out = f"{val:.12g}"
+            out = format(val, _NUM_FMT)
         else:
             out = str(val)
-        self.result_edit.setText(out)
+        # setText restyles and repaints even when the text is the same
+        if out != self._last_out:
+            self.result_edit.setText(out)
+            self._last_out = out
+        self._last_display_value = val if isinstance(val, (int, float)) else None
 
     def _set_result_text(self, text):
         self.result_edit.setText(text)
+        self._last_out = text
+        self._last_display_value = None
 
     def _commit_result(self, value, expr):
+        # history keeps the ANS it was computed with, so reusing an entry gives the same value
+        if _ANS_RE.search(expr):
+            try:
+                ans = str(self.last_ans)
+            except ValueError:
+                # int too long to print (over the int str-digits limit); keep ANS as written
+                ans = None
+            if ans is not None:
+                expr = _ANS_RE.sub(f"({ans})" if ans.startswith("-") else ans, expr)
+        # format before touching any state: str() can raise for huge ints, and history
+        # must stay one-to-one with history_list rows for the cap below
+        disp = format(value, _NUM_FMT) if isinstance(value, float) else str(value)
         # store history and last ans
         self.last_ans = value
         self.history.append((expr, value))
-        disp = f"{value:.12g}" if isinstance(value, float) else str(value)
         self.history_list.addItem(f"{expr} = {disp}")
+        if len(self.history) > _HISTORY_LIMIT:
+            del self.history[:-_HISTORY_LIMIT]
+            self.history_list.takeItem(0)
         self.history_list.scrollToBottom()
 
     def all_clear(self):
-        self.expr_label.setText("")
-        self.result_edit.setText("0")
+        self._set_expr("")
+        self._set_result_display(0)
 
     # ----------------------------
     # Memory operations
@@ -448,23 +592,37 @@ class CalcWindow(QtWidgets.QWidget):
 
     def mem_add(self):
         # add current visible result if numeric
+        if self._last_display_value is not None:
+            try:
+                self.memory += float(self._last_display_value)
+                return
+            except OverflowError:
+                # int too large for a float; fall back to parsing the display text
+                pass
         try:
             v = float(self.result_edit.text())
             self.memory += v
         except Exception:
             try:
-                v = float(safe_eval(self.expr_label.text()))
+                v = float(safe_eval(self.expr_label.text(), self.last_ans))
                 self.memory += v
             except Exception:
                 return
 
     def mem_sub(self):
+        if self._last_display_value is not None:
+            try:
+                self.memory -= float(self._last_display_value)
+                return
+            except OverflowError:
+                # int too large for a float; fall back to parsing the display text
+                pass
         try:
             v = float(self.result_edit.text())
             self.memory -= v
         except Exception:
             try:
-                v = float(safe_eval(self.expr_label.text()))
+                v = float(safe_eval(self.expr_label.text(), self.last_ans))
                 self.memory -= v
             except Exception:
                 return
@@ -476,7 +634,7 @@ class CalcWindow(QtWidgets.QWidget):
         text = item.text()
         if "=" in text:
             expr = text.split("=",1)[0].strip()
-            self.expr_label.setText(expr)
+            self._set_expr(expr)
 
     # ----------------------------
     # Theme & Mini Mode
@@ -488,23 +646,16 @@ class CalcWindow(QtWidgets.QWidget):
     def toggle_mini_mode(self):
         # mini mode hides history and scientific rows to be compact
         self.mini_mode = not self.mini_mode
-        # show/hide history
+        # hide/show history and scientific rows in one repaint
+        vis = not self.mini_mode
+        self.setUpdatesEnabled(False)
+        for w in self._sci_widgets:
+            w.setVisible(vis)
+        self.history_list.setVisible(vis)
+        self.setUpdatesEnabled(True)
         if self.mini_mode:
-            # hide history widget and scientific rows: hide rows 5,6,7
-            for r in [5,6,7]:
-                for c in range(4):
-                    w = self.grid.itemAtPosition(r,c)
-                    if w:
-                        w.widget().setVisible(False)
-            self.history_list.setVisible(False)
             self.setMinimumSize(320, 420)
         else:
-            for r in [5,6,7]:
-                for c in range(4):
-                    w = self.grid.itemAtPosition(r,c)
-                    if w:
-                        w.widget().setVisible(True)
-            self.history_list.setVisible(True)
             self.setMinimumSize(360, 560)
 
     # ----------------------------
@@ -519,8 +670,7 @@ class CalcWindow(QtWidgets.QWidget):
         txt = cb.text()
         if txt:
             # sanitize: only allow digits, operators, parens, dot, letters (for functions)
-            allowed = "0123456789.+-*/()%eEpiPIabcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            filtered = "".join(ch for ch in txt if ch in allowed)
+            filtered = txt.encode("ascii", "ignore").translate(None, _PASTE_DELETE).decode("ascii")
             self._add(filtered)
 
     # ----------------------------